@@ -4,8 +4,64 @@ from urllib.parse import urlparse, urlunparse, quote, unquote
 import os
 import time
 import re
+import uuid
+import hashlib
+import sqlite3
+import threading
 import mimetypes # Used to guess file extensions from MIME types
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
 
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Shared session so every download reuses the keep-alive connections to the
+# same host instead of paying a fresh TCP+TLS handshake per URL.
+_session = requests.Session()
+_session.headers.update(_HEADERS)
+_POOL_MAXSIZE = 16
+_adapter = HTTPAdapter(pool_connections=2, pool_maxsize=_POOL_MAXSIZE, max_retries=0)
+_session.mount('https://', _adapter)
+_session.mount('http://', _adapter)
+
+def _mount_pool(pool_maxsize):
+    """
+    Replaces the session's connection pool with one that keeps `pool_maxsize`
+    connections alive, closing the idle sockets of the pool it replaces.
+    """
+    old_adapters = {_session.get_adapter('https://'), _session.get_adapter('http://')}
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize, max_retries=0)
+    _session.mount('https://', adapter)
+    _session.mount('http://', adapter)
+    for old_adapter in old_adapters:
+        old_adapter.close()
+
+# Read bodies in large chunks through a large write buffer so multi-MB files
+# take few Python-level iterations and write() calls.
+_CHUNK_SIZE = 256 * 1024
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Only downloads at least this large are synced and dropped from the page cache;
+# smaller files cannot crowd it enough to be worth a synchronous disk flush.
+_DROP_CACHE_MIN_BYTES = 4 << 20
+
+# Characters that are not allowed in filenames
+_SANITIZE_RE = re.compile(r'[\\/:*?"<>|]')
+
+# Whitespace cleanup applied to every extracted page, compiled once.
+_RE_BLANK = re.compile(r'\n\s*\n')
+_RE_WS = re.compile(r'[ \t]+')
+
+@lru_cache(maxsize=65536)
+def _cached_urlparse(url):
+    """
+    Memoized `urlparse`, since the same URLs are parsed repeatedly during a run.
+    """
+    return urlparse(url)
+
+@lru_cache(maxsize=16384)
 def sanitize_filename(url):
     """
     Sanitizes a URL to create a valid and safe filename.
@@ -15,7 +71,7 @@ def sanitize_filename(url):
     decoded_url = unquote(url)
     
     # Parse the URL to get path and query components
-    parsed_url = urlparse(decoded_url)
+    parsed_url = _cached_urlparse(decoded_url)
     path_segments = [s for s in parsed_url.path.split('/') if s]
     
     # Use the last path segment or the netloc if no path
@@ -26,7 +82,6 @@ def sanitize_filename(url):
         
     # If there's a query string, append a hash of it to make filenames unique
     if parsed_url.query:
-        import hashlib
         query_hash = hashlib.md5(parsed_url.query.encode('utf-8')).hexdigest()[:8]
         if filename:
             filename = f"{filename}_{query_hash}"
@@ -39,7 +94,7 @@ def sanitize_filename(url):
         filename = filename_parts[0]
 
     # Replace invalid characters for filenames with underscores
-    filename = re.sub(r'[\\/:*?"<>|]', '_', filename)
+    filename = _SANITIZE_RE.sub('_', filename)
     # Trim leading/trailing spaces and dots
     filename = filename.strip(' .')
     # Ensure it's not empty
@@ -60,7 +115,7 @@ def get_content_type_and_extension(url, response_headers):
         return content_type, ext
 
     # If MIME type doesn't give a good extension, try from URL path
-    parsed_url = urlparse(url)
+    parsed_url = _cached_urlparse(url)
     path = parsed_url.path
     
     # Extract extension from path if it exists
@@ -84,8 +139,295 @@ def get_content_type_and_extension(url, response_headers):
     
     return content_type, '.bin' # Default binary if nothing else matches
 
+# Output subdirectory for a (normalized) Content-Type, with the file extension
+# as a fallback when the server reports a generic type.
+_CT_TO_DIR = {
+    'text/html': 'html_pages',
+    'application/pdf': 'documents',
+    'application/msword': 'documents',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'documents',
+    'application/vnd.ms-excel': 'documents',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': 'documents',
+    'application/vnd.ms-powerpoint': 'documents',
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation': 'documents',
+    'application/zip': 'other_files', # Or create a 'archives' folder if needed
+}
+_EXT_TO_DIR = {
+    '.pdf': 'documents',
+    '.doc': 'documents', '.docx': 'documents',
+    '.xls': 'documents', '.xlsx': 'documents',
+    '.ppt': 'documents', '.pptx': 'documents',
+    '.zip': 'other_files',
+}
+
+def _target_subdir(content_type, file_ext):
+    """
+    Picks the output subdirectory name for a download from its content type
+    (as returned by `get_content_type_and_extension`) and file extension.
+    """
+    subdir = _CT_TO_DIR.get(content_type)
+    if subdir:
+        return subdir
+    if content_type.startswith('image/'):
+        return 'images'
+    return _EXT_TO_DIR.get(file_ext, 'other_files')
+
+def _drop_from_page_cache(f):
+    """
+    Writes `f` through to disk and tells the kernel its pages will not be read
+    again, so large one-off downloads do not push more useful data out of the
+    page cache. The fdatasync is required: POSIX_FADV_DONTNEED does not evict
+    dirty pages, so without it nothing is dropped. It blocks the calling worker
+    until the file is on disk, so it is only used for large files (see
+    `_DROP_CACHE_MIN_BYTES`). Does nothing where posix_fadvise is unavailable.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    f.flush()
+    try:
+        os.fdatasync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass # Only advisory; never fail a download over it
+
+class _RateLimiter:
+    """
+    Spaces out request starts across all download workers so the host sees at
+    most one new request every `min_interval` seconds, however many run at once.
+    """
+
+    def __init__(self, min_interval):
+        self._min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+
+    def wait(self):
+        """
+        Blocks until the calling worker may start its next request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed)
+            self._next_allowed = start + self._min_interval
+        if start > now:
+            time.sleep(start - now)
+
+def _probe_skip_reason(url, skip_content_types, max_content_length):
+    """
+    Issues a HEAD request for `url` and returns the reason it should not be
+    downloaded, or None if it should. If the HEAD request itself fails, the URL
+    is downloaded as usual.
+    """
+    try:
+        head = _session.head(url, allow_redirects=True, timeout=10)
+        head.raise_for_status()
+    except requests.exceptions.RequestException:
+        return None
+
+    content_type = head.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if skip_content_types and content_type.startswith(tuple(skip_content_types)):
+        return f"content type '{content_type}' is skipped"
+
+    content_length = head.headers.get('Content-Length', '')
+    if max_content_length is not None and content_length.isdigit() and int(content_length) > max_content_length:
+        return f"{content_length} bytes exceeds the {max_content_length} byte limit"
+    return None
+
+class _DownloadIndex:
+    """
+    Persistent SQLite record of what earlier runs downloaded, keyed by URL, so
+    unchanged URLs can be revalidated with conditional requests instead of
+    being downloaded again. Safe to share between the download worker threads.
+    """
+
+    def __init__(self, db_path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen('
+            'url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_sha256 TEXT, path TEXT, '
+            'text_path TEXT)'
+        )
+        self._conn.commit()
+
+    def conditional_headers(self, url):
+        """
+        Returns the If-None-Match / If-Modified-Since headers for `url`, or None
+        if it was never downloaded or any file saved for it is gone (for HTML
+        pages that includes the extracted text file).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, path, text_path FROM seen WHERE url = ?', (url,)
+            ).fetchone()
+        if not row:
+            return None
+        etag, last_modified, path, text_path = row
+        if not path or not os.path.exists(path):
+            return None
+        if text_path and not os.path.exists(text_path):
+            return None
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers or None
+
+    def record(self, url, response_headers, content_sha256, path, text_path=None):
+        """
+        Stores the validators, content hash and saved paths of a fresh download.
+        Paths are stored absolute so the index works from any working directory.
+        """
+        if text_path:
+            text_path = os.path.abspath(text_path)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO seen(url, etag, last_modified, content_sha256, path, text_path) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (url, response_headers.get('ETag'), response_headers.get('Last-Modified'),
+                 content_sha256, os.path.abspath(path), text_path)
+            )
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+def _extract_and_write(url, html_bytes, text_filepath):
+    """
+    Extracts the visible text from a downloaded HTML page and saves it.
+    Runs on the extraction pool of `download_content_from_urls`.
+    """
+    try:
+        soup = BeautifulSoup(html_bytes, 'lxml')
+        for script_or_style in soup(['script', 'style']):
+            script_or_style.decompose()
+        text_content = soup.get_text(separator='\n', strip=True)
+        text_content = _RE_BLANK.sub('\n\n', text_content)
+        text_content = _RE_WS.sub(' ', text_content)
+        
+        with open(text_filepath, 'w', encoding='utf-8') as f:
+            f.write(text_content)
+        print(f"Saved plain text to: {text_filepath}")
+    except Exception as e:
+        print(f"Error extracting text from HTML for {url}: {e}")
+        # Leave no stale text behind, so the next run re-downloads the page
+        if os.path.exists(text_filepath):
+            os.remove(text_filepath)
+
+def _download_url(url, label, dirs, limiter, max_retries, retry_delay,
+                  skip_content_types, max_content_length, index, extractor):
+    """
+    Downloads a single URL (with retries) into the matching folder from `dirs`.
+    Runs on a worker thread of `download_content_from_urls`.
+    """
+    html_dir = dirs['html_pages']
+    text_dir = dirs['text_content']
+
+    print(f"\nProcessing URL {label}: {url}")
+
+    # Probe with a cheap HEAD request first so rejected files are never transferred
+    if skip_content_types or max_content_length is not None:
+        limiter.wait()
+        skip_reason = _probe_skip_reason(url, skip_content_types, max_content_length)
+        if skip_reason:
+            print(f"Skipping URL: {url} ({skip_reason})")
+            return
+
+    # Ask the server to send the body only if it changed since the last run
+    request_headers = index.conditional_headers(url)
+
+    for attempt in range(max_retries):
+        response = None
+        try:
+            limiter.wait()
+            response = _session.get(url, headers=request_headers, stream=True, timeout=15)
+            if response.status_code == 304:
+                print(f"Not modified since last run: {url}")
+                break
+            response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+
+            content_type, file_ext = get_content_type_and_extension(url, response.headers)
+            
+            # Determine the target directory based on content type
+            target_dir = dirs[_target_subdir(content_type, file_ext)]
+            
+            base_filename = sanitize_filename(url)
+            
+            # Handle HTML content specially: save raw HTML and extracted text
+            if target_dir == html_dir:
+                # Different URLs can share a last path segment (/x/about, /y/about),
+                # so key HTML names on a short hash of the full URL. Each URL maps
+                # to its own file, which later runs of the same URL overwrite.
+                url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()[:8]
+                html_filepath = os.path.join(target_dir, f"{base_filename}_{url_hash}.html")
+                text_filepath = os.path.join(text_dir, f"{base_filename}_{url_hash}.txt")
+                
+                # Save raw HTML, keeping a copy of the bytes for text extraction
+                # since the streamed body can only be read once
+                html_bytes = bytearray()
+                with open(html_filepath, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                    for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                        f.write(chunk)
+                        html_bytes.extend(chunk)
+                content_sha256 = hashlib.sha256(html_bytes).hexdigest()
+                saved_path = html_filepath
+                saved_text_path = text_filepath
+                print(f"Saved HTML to: {html_filepath}")
+
+                # Extract and save plain text off this thread so the next
+                # download can start while the page is being parsed
+                extractor.submit(_extract_and_write, url, bytes(html_bytes), text_filepath)
+            else:
+                # For other file types, save directly
+                filepath = os.path.join(target_dir, f"{base_filename}{file_ext}")
+                # Claim the filename atomically; on a clash (an earlier run or
+                # another worker) fall back to a random suffix
+                flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+                try:
+                    fd = os.open(filepath, flags, 0o644)
+                except FileExistsError:
+                    filepath = os.path.join(target_dir, f"{base_filename}_{uuid.uuid4().hex[:8]}{file_ext}")
+                    fd = os.open(filepath, flags, 0o644)
+
+                digest = hashlib.sha256()
+                bytes_written = 0
+                with os.fdopen(fd, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                    for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        bytes_written += len(chunk)
+                    if bytes_written >= _DROP_CACHE_MIN_BYTES:
+                        _drop_from_page_cache(f)
+                content_sha256 = digest.hexdigest()
+                saved_path = filepath
+                saved_text_path = None
+                print(f"Saved {content_type} to: {filepath}")
+
+            index.record(url, response.headers, content_sha256, saved_path, saved_text_path)
+            
+            break # Break from retry loop if successful
+
+        except requests.exceptions.Timeout:
+            print(f"Timeout occurred while fetching {url}. Retrying ({attempt + 1}/{max_retries})...")
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching {url}: {e}. Retrying ({attempt + 1}/{max_retries})...")
+        except IOError as e:
+            print(f"Error saving file for {url}: {e}. Retrying ({attempt + 1}/{max_retries})...")
+        except Exception as e:
+            print(f"An unexpected error occurred for {url}: {e}. Retrying ({attempt + 1}/{max_retries})...")
+        finally:
+            if response is not None:
+                response.close() # Return the connection to the session pool
+        
+        if attempt < max_retries - 1:
+            time.sleep(retry_delay) # Wait before retrying
+    else:
+        print(f"Failed to download {url} after {max_retries} attempts.")
+
 def download_content_from_urls(url_list_file, output_base_dir="downloaded_content", 
-                               politeness_delay=0.5, max_retries=3, retry_delay=1):
+                               politeness_delay=0.5, max_retries=3, retry_delay=1,
+                               concurrency=8, skip_content_types=(), max_content_length=None):
     """
     Reads URLs from a text file, downloads their content, and saves them
     into organized folders based on content type. Only downloads content
@@ -94,26 +436,28 @@ def download_content_from_urls(url_list_file, output_base_dir="downloaded_conten
     Args:
         url_list_file (str): Path to the text file containing URLs (one per line).
         output_base_dir (str): Base directory where all downloaded content will be stored.
-        politeness_delay (float): Delay in seconds between each URL download request.
+        politeness_delay (float): Minimum delay in seconds between the start of any two
+                                  requests to the server, shared by all workers.
         max_retries (int): Maximum number of retries for fetching a URL.
         retry_delay (int): Delay in seconds between retries.
+        concurrency (int): Maximum number of downloads in flight at once. This overlaps
+                           slow responses; it does not raise the request rate.
+        skip_content_types (tuple): Content types (or prefixes such as 'video/') that
+                                    are not downloaded. Checked with a HEAD request.
+        max_content_length (int): Files whose reported size in bytes exceeds this are
+                                  not downloaded. Checked with a HEAD request.
+
+    What was downloaded is recorded in 'crawl.db' (SQLite) under `output_base_dir`;
+    on later runs unchanged URLs are skipped via conditional requests.
     """
     # Create base output directory if it doesn't exist
     os.makedirs(output_base_dir, exist_ok=True)
     
-    # Define subdirectories for different content types
-    html_dir = os.path.join(output_base_dir, "html_pages")
-    text_dir = os.path.join(output_base_dir, "text_content")
-    documents_dir = os.path.join(output_base_dir, "documents")
-    images_dir = os.path.join(output_base_dir, "images")
-    other_files_dir = os.path.join(output_base_dir, "other_files")
-
-    # Create all subdirectories
-    os.makedirs(html_dir, exist_ok=True)
-    os.makedirs(text_dir, exist_ok=True)
-    os.makedirs(documents_dir, exist_ok=True)
-    os.makedirs(images_dir, exist_ok=True)
-    os.makedirs(other_files_dir, exist_ok=True)
+    # Define and create subdirectories for different content types
+    dirs = {}
+    for name in ("html_pages", "text_content", "documents", "images", "other_files"):
+        dirs[name] = os.path.join(output_base_dir, name)
+        os.makedirs(dirs[name], exist_ok=True)
 
     urls_to_download = []
     try:
@@ -127,104 +471,42 @@ def download_content_from_urls(url_list_file, output_base_dir="downloaded_conten
         print(f"Error reading URL list file: {e}")
         return
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-
     # Define the allowed domain for content scraping
     allowed_domain = "www.mosdac.gov.in"
 
-    for i, url in enumerate(urls_to_download):
-        print(f"\nProcessing URL {i+1}/{len(urls_to_download)}: {url}")
-        
-        parsed_url = urlparse(url)
-        if parsed_url.netloc != allowed_domain:
-            print(f"Skipping URL: {url} (Domain does not match '{allowed_domain}')")
-            continue # Skip to the next URL if domain doesn't match
+    # Drop URLs on other domains and repeated URLs once, before any worker sees
+    # them, so no two workers ever write the same URL's files at the same time
+    found = len(urls_to_download)
+    urls_to_download = [url for url in dict.fromkeys(urls_to_download)
+                        if _cached_urlparse(url).netloc == allowed_domain]
+    total = len(urls_to_download)
+    print(f"Keeping {total} URLs on '{allowed_domain}', skipping {found - total} duplicates or on other domains")
 
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, headers=headers, stream=True, timeout=15)
-                response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+    index = _DownloadIndex(os.path.join(output_base_dir, "crawl.db"))
+    limiter = _RateLimiter(politeness_delay)
 
-                content_type, file_ext = get_content_type_and_extension(url, response.headers)
-                
-                # Determine the target directory based on content type
-                target_dir = other_files_dir
-                if 'text/html' in content_type:
-                    target_dir = html_dir
-                elif 'application/pdf' in content_type or file_ext == '.pdf':
-                    target_dir = documents_dir
-                elif 'image/' in content_type:
-                    target_dir = images_dir
-                elif 'application/msword' in content_type or 'application/vnd.openxmlformats-officedocument.wordprocessingml.document' in content_type or file_ext in ['.doc', '.docx']:
-                    target_dir = documents_dir
-                elif 'application/vnd.ms-excel' in content_type or 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' in content_type or file_ext in ['.xls', '.xlsx']:
-                    target_dir = documents_dir
-                elif 'application/vnd.ms-powerpoint' in content_type or 'application/vnd.openxmlformats-officedocument.presentationml.presentation' in content_type or file_ext in ['.ppt', '.pptx']:
-                    target_dir = documents_dir
-                elif 'application/zip' in content_type or file_ext == '.zip':
-                    target_dir = other_files_dir # Or create a 'archives' folder if needed
-                
-                base_filename = sanitize_filename(url)
-                
-                # Handle HTML content specially: save raw HTML and extracted text
-                if target_dir == html_dir:
-                    html_filepath = os.path.join(target_dir, f"{base_filename}.html")
-                    text_filepath = os.path.join(text_dir, f"{base_filename}.txt")
-                    
-                    # Save raw HTML
-                    with open(html_filepath, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                    print(f"Saved HTML to: {html_filepath}")
-
-                    # Extract and save plain text
-                    try:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        for script_or_style in soup(['script', 'style']):
-                            script_or_style.decompose()
-                        text_content = soup.get_text(separator='\n', strip=True)
-                        text_content = re.sub(r'\n\s*\n', '\n\n', text_content)
-                        text_content = re.sub(r'[ \t]+', ' ', text_content)
-                        
-                        with open(text_filepath, 'w', encoding='utf-8') as f:
-                            f.write(text_content)
-                        print(f"Saved plain text to: {text_filepath}")
-                    except Exception as e:
-                        print(f"Error extracting text from HTML for {url}: {e}")
-                else:
-                    # For other file types, save directly
-                    filepath = os.path.join(target_dir, f"{base_filename}{file_ext}")
-                    # Ensure unique filename if it already exists
-                    counter = 1
-                    original_filepath = filepath
-                    while os.path.exists(filepath):
-                        filepath = os.path.join(target_dir, f"{base_filename}_{counter}{file_ext}")
-                        counter += 1
-
-                    with open(filepath, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                    print(f"Saved {content_type} to: {filepath}")
-                
-                break # Break from retry loop if successful
-
-            except requests.exceptions.Timeout:
-                print(f"Timeout occurred while fetching {url}. Retrying ({attempt + 1}/{max_retries})...")
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching {url}: {e}. Retrying ({attempt + 1}/{max_retries})...")
-            except IOError as e:
-                print(f"Error saving file for {url}: {e}. Retrying ({attempt + 1}/{max_retries})...")
-            except Exception as e:
-                print(f"An unexpected error occurred for {url}: {e}. Retrying ({attempt + 1}/{max_retries})...")
-            
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay) # Wait before retrying
-        else:
-            print(f"Failed to download {url} after {max_retries} attempts.")
+    # A pool smaller than the worker count discards connections ("Connection
+    # pool is full"), so grow it to give every worker its own keep-alive socket
+    if concurrency > _POOL_MAXSIZE:
+        _mount_pool(concurrency)
 
-        time.sleep(politeness_delay) # Politeness delay between URLs
+    # Downloads are I/O bound, so overlap them on a bounded pool of threads
+    # sharing the pooled session instead of fetching one URL at a time.
+    # HTML text extraction runs on its own small pool, pipelined behind them.
+    try:
+        with ThreadPoolExecutor(max_workers=2) as extractor:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [
+                    executor.submit(_download_url, url, f"{i+1}/{total}", dirs,
+                                    limiter, max_retries, retry_delay,
+                                    skip_content_types, max_content_length, index, extractor)
+                    for i, url in enumerate(urls_to_download)
+                ]
+                # Re-raise anything that escaped a worker instead of losing it
+                for future in futures:
+                    future.result()
+    finally:
+        index.close()
 
 # --- Example Usage ---
 if __name__ == "__main__":
@@ -1,10 +1,35 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 from bs4 import BeautifulSoup
 
+def _extract_one(args):
+    """
+    Extracts the text from one HTML file and writes it to its output path.
+    Runs in a worker process of `extract_text_from_html_files_and_save`.
+    """
+    filepath, output_filepath = args
+    filename = os.path.basename(filepath)
+    try:
+        # Read raw bytes and let the parser detect the encoding
+        with open(filepath, 'rb') as f:
+            html_content = f.read()
+
+        soup = BeautifulSoup(html_content, 'lxml')
+        # Get all the text from the document, excluding script and style tags
+        text_content = soup.get_text(separator='\n', strip=True)
+
+        with open(output_filepath, 'w', encoding='utf-8') as outfile:
+            outfile.write(text_content)
+        print(f"✨ Extracted content from '{filename}' and saved to: '{output_filepath}'")
+
+    except Exception as e:
+        print(f"❌ Error processing '{filename}': {e}")
+
 def extract_text_from_html_files_and_save(html_files_directory, output_directory):
     """
     Extracts text content from all HTML files in a given directory
     and saves each extracted text to a separate file in the output directory.
+    Files are parsed in parallel across worker processes.
 
     Args:
         html_files_directory (str): The path to the directory containing HTML files.
@@ -19,32 +44,25 @@ def extract_text_from_html_files_and_save(html_files_directory, output_directory
     print(f"✅ Output directory '{output_directory}' ensured.")
 
     print(f"🚀 Processing HTML files in: {html_files_directory}")
-    for filename in os.listdir(html_files_directory):
-        if filename.endswith(".html") or filename.endswith(".htm"):
-            filepath = os.path.join(html_files_directory, filename)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-
-                soup = BeautifulSoup(html_content, 'html.parser')
-                # Get all the text from the document, excluding script and style tags
-                text_content = soup.get_text(separator='\n', strip=True)
-
+    pairs = []
+    with os.scandir(html_files_directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith((".html", ".htm")):
                 # Determine the output filename (e.g., "original_file.html" -> "original_file.txt")
-                output_filename = os.path.splitext(filename)[0] + ".txt"
+                output_filename = os.path.splitext(entry.name)[0] + ".txt"
                 output_filepath = os.path.join(output_directory, output_filename)
+                pairs.append((entry.path, output_filepath))
 
-                with open(output_filepath, 'w', encoding='utf-8') as outfile:
-                    outfile.write(text_content)
-                print(f"✨ Extracted content from '{filename}' and saved to: '{output_filepath}'")
-
-            except Exception as e:
-                print(f"❌ Error processing '{filename}': {e}")
+    # Parsing is CPU bound and the files are independent, so spread them
+    # over one process per core instead of a single interpreter.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(_extract_one, pairs, chunksize=8))
 
-# Specify the directory where your HTML files are stored
-html_directory = "mosdac_downloaded_content/html_pages"
-# Specify the directory where you want to save the extracted text files
-output_text_directory = "mosdac_extracted_text"
+if __name__ == "__main__":
+    # Specify the directory where your HTML files are stored
+    html_directory = "mosdac_downloaded_content/html_pages"
+    # Specify the directory where you want to save the extracted text files
+    output_text_directory = "mosdac_extracted_text"
 
-# Run the function to extract and save the content
-extract_text_from_html_files_and_save(html_directory, output_text_directory)
\ No newline at end of file
+    # Run the function to extract and save the content
+    extract_text_from_html_files_and_save(html_directory, output_text_directory)
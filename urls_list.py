@@ -4,15 +4,38 @@ from urllib.parse import urljoin, urlparse
 import time
 import re
 import os
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
 
-# Global sets and lists for tracking during a single scrape operation.
-# These will be cleared or re-initialized by the main function for each new scrape call.
-_visited_urls = set() # URLs for which content has been scraped in the current run
-_all_discovered_urls = set() # All unique URLs found in the current run
-_all_extracted_content = [] # Content of pages scraped in the current run
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Shared session so page fetches reuse keep-alive connections to the host.
+_session = requests.Session()
+_session.headers.update(_HEADERS)
+_adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16, max_retries=0)
+_session.mount('https://', _adapter)
+_session.mount('http://', _adapter)
+
+# Whitespace cleanup applied to every extracted page, compiled once.
+_RE_BLANK = re.compile(r'\n\s*\n')
+_RE_WS = re.compile(r'[ \t]+')
+
+@dataclass
+class CrawlState:
+    """
+    Tracking state for a single scrape operation. Each call to
+    `scrape_website_to_file` creates its own, so scrapes do not share state.
+    """
+    visited: set = field(default_factory=set) # URLs whose page has been fetched
+    discovered: set = field(default_factory=set) # All unique URLs found
+    extracted: list = field(default_factory=list) # Content of pages scraped
 
 # List of common file extensions to identify non-HTML pages.
-# URLs ending with these extensions will be added to _all_discovered_urls but
+# URLs ending with these extensions will be recorded as discovered but
 # their content will not be scraped recursively for more links.
 _FILE_EXTENSIONS = {
     '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.zip', '.rar',
@@ -24,17 +47,40 @@ _FILE_EXTENSIONS = {
     '.css', '.js', '.php', '.asp', '.aspx', '.jsp', '.cfm', '.cgi'
 }
 
+# The same check as one case-insensitive pattern anchored at the end of the path.
+_FILE_EXT_RE = re.compile(
+    r'\.(?:' + '|'.join(re.escape(ext.lstrip('.')) for ext in sorted(_FILE_EXTENSIONS)) + r')$',
+    re.IGNORECASE
+)
+
+@lru_cache(maxsize=65536)
+def _cached_urlparse(url):
+    """
+    Memoized `urlparse`, since the same URLs are parsed repeatedly during a run.
+    """
+    return urlparse(url)
+
+@lru_cache(maxsize=4096)
 def _is_file_url(url):
     """
     Checks if a given URL points to a common file type based on its extension.
     This is a helper function, intended for internal use within the scraping module.
+    Results are cached since the same links recur across many pages.
     """
-    parsed_url = urlparse(url)
-    path = parsed_url.path.lower()
-    for ext in _FILE_EXTENSIONS:
-        if path.endswith(ext):
-            return True
-    return False
+    return _FILE_EXT_RE.search(_cached_urlparse(url).path) is not None
+
+def _normalize_link(base_url, href):
+    """
+    Resolves `href` against `base_url` and returns the absolute URL if it is
+    an http(s) link without a fragment, otherwise None.
+    """
+    full_url = urljoin(base_url, href)
+    parsed_full_url = _cached_urlparse(full_url)
+    if parsed_full_url.scheme not in ('http', 'https') or \
+       parsed_full_url.fragment or \
+       full_url.startswith('mailto:'):
+        return None
+    return parsed_full_url._replace(fragment="").geturl()
 
 def _get_page_content(url, max_retries=3, delay=1):
     """
@@ -53,37 +99,28 @@ def _get_page_content(url, max_retries=3, delay=1):
             - list: A list of all unique absolute URLs found on the page (from 'href' attributes).
             Returns (None, None) if an error persists after retries.
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     for attempt in range(max_retries):
         try:
             print(f"Fetching content from: {url} (Attempt {attempt + 1}/{max_retries})")
-            response = requests.get(url, headers=headers, timeout=10)
+            response = _session.get(url, timeout=10)
             response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Parse the raw bytes and let the parser detect the encoding
+            soup = BeautifulSoup(response.content, 'lxml')
 
             # --- Text Extraction ---
             for script_or_style in soup(['script', 'style']):
                 script_or_style.decompose()
             text_content = soup.get_text(separator='\n', strip=True)
-            text_content = re.sub(r'\n\s*\n', '\n\n', text_content)
-            text_content = re.sub(r'[ \t]+', ' ', text_content)
+            text_content = _RE_BLANK.sub('\n\n', text_content)
+            text_content = _RE_WS.sub(' ', text_content)
 
             # --- Link Extraction ---
-            found_links = set()
-            for a_tag in soup.find_all('a', href=True):
-                href = a_tag['href']
-                full_url = urljoin(url, href)
-                parsed_full_url = urlparse(full_url)
-
-                if parsed_full_url.scheme in ['http', 'https'] and \
-                   not parsed_full_url.fragment and \
-                   not full_url.startswith('mailto:'):
-                    normalized_url = parsed_full_url._replace(fragment="").geturl()
-                    found_links.add(normalized_url)
+            found_links = {
+                link for link in (_normalize_link(url, a_tag['href'])
+                                  for a_tag in soup.find_all('a', href=True))
+                if link
+            }
             
             return text_content, list(found_links)
 
@@ -100,56 +137,41 @@ def _get_page_content(url, max_retries=3, delay=1):
     print(f"Failed to fetch {url} after {max_retries} attempts.")
     return None, None # Return None for content and links after all retries fail
 
-def _recursive_scrape(base_url_netloc, current_url, max_depth, current_depth, 
-                      scrape_content_limit, politeness_delay):
+def _crawl(state, start_url, base_url_netloc, max_depth, scrape_content_limit, politeness_delay):
     """
-    Internal recursive function to perform the actual web scraping.
+    Internal breadth-first crawl driven by an explicit work queue.
     It fetches content from pages that are internal, not identified as files,
     and within the specified depth and page limits. It also discovers and records
-    all unique URLs encountered.
+    all unique URLs encountered, recording everything in `state`.
     """
-    global _all_discovered_urls, _visited_urls, _all_extracted_content
-
-    _all_discovered_urls.add(current_url)
-
-    should_scrape_content = (
-        current_url not in _visited_urls and
-        current_depth <= max_depth and
-        len(_all_extracted_content) < scrape_content_limit
-    )
-
-    text_content = None
-    found_links = None
-
-    if should_scrape_content:
-        _visited_urls.add(current_url)
+    state.discovered.add(start_url)
+
+    queue = deque([(start_url, 0)])
+    while queue:
+        current_url, current_depth = queue.popleft()
+        if current_url in state.visited:
+            continue
+        if len(state.extracted) >= scrape_content_limit:
+            print(f"Reached maximum content page limit ({scrape_content_limit}). Stopping further content scraping.")
+            break
+
+        if state.visited:
+            time.sleep(politeness_delay)
+        state.visited.add(current_url)
         text_content, found_links = _get_page_content(current_url)
 
         if text_content:
-            _all_extracted_content.append({'url': current_url, 'text': text_content})
-    else:
-        # Even if not scraping content due to limits, if this is a new URL
-        # not yet processed for its links, fetch its links.
-        if current_url not in _visited_urls:
-            _visited_urls.add(current_url) # Mark as visited to avoid re-fetching
-            _, found_links = _get_page_content(current_url) # Only interested in links here
-
-    if found_links:
-        for link in found_links:
-            _all_discovered_urls.add(link)
-
-            parsed_link = urlparse(link)
+            state.extracted.append({'url': current_url, 'text': text_content})
+
+        for link in found_links or ():
+            state.discovered.add(link)
+
+            parsed_link = _cached_urlparse(link)
             is_internal = parsed_link.netloc == base_url_netloc
             is_file = _is_file_url(link)
 
-            if is_internal and not is_file and link not in _visited_urls and current_depth < max_depth:
-                if len(_all_extracted_content) >= scrape_content_limit:
-                    print(f"Reached maximum content page limit ({scrape_content_limit}). Stopping further content scraping recursion.")
-                    break
-                
-                time.sleep(politeness_delay)
-                _recursive_scrape(base_url_netloc, link, max_depth, current_depth + 1, 
-                                  scrape_content_limit, politeness_delay)
+            if is_internal and not is_file and link not in state.visited and current_depth < max_depth:
+                queue.append((link, current_depth + 1))
 
 def scrape_website_to_file(start_url, output_filename="discovered_urls.txt", 
                            max_pages_to_visit=50, max_depth=3, politeness_delay=0.5):
@@ -162,7 +184,7 @@ def scrape_website_to_file(start_url, output_filename="discovered_urls.txt",
         output_filename (str): The name of the text file to save the discovered URLs.
         max_pages_to_visit (int): Maximum number of unique pages for which content
                                   will be extracted.
-        max_depth (int): Maximum recursion depth for content extraction.
+        max_depth (int): Maximum link depth from the start URL for content extraction.
         politeness_delay (float): Delay in seconds between HTTP requests to be polite
                                   to the server.
 
@@ -172,31 +194,24 @@ def scrape_website_to_file(start_url, output_filename="discovered_urls.txt",
                     for the pages from which content was extracted.
             - list: A sorted list of all unique URLs discovered during the scrape.
     """
-    global _visited_urls, _all_discovered_urls, _all_extracted_content
-
-    # Clear global states for a fresh scrape
-    _visited_urls.clear()
-    _all_discovered_urls.clear()
-    _all_extracted_content = []
-
-    parsed_start_url = urlparse(start_url)
+    parsed_start_url = _cached_urlparse(start_url)
     base_url_netloc = parsed_start_url.netloc
 
     print(f"Starting web scraping from: {start_url}")
     print(f"Maximum pages for content extraction: {max_pages_to_visit}")
-    print(f"Maximum recursion depth for content extraction: {max_depth}")
+    print(f"Maximum link depth for content extraction: {max_depth}")
     print(f"Saving discovered URLs to: {output_filename}")
     print("\n--- Scraping in progress (this may take a while) ---\n")
 
-    _recursive_scrape(base_url_netloc, start_url, max_depth, 0, 
-                      max_pages_to_visit, politeness_delay)
+    state = CrawlState()
+    _crawl(state, start_url, base_url_netloc, max_depth, max_pages_to_visit, politeness_delay)
 
     print("\n--- Scraping complete! ---\n")
-    print(f"Total unique pages for which content was extracted: {len(_all_extracted_content)}")
-    print(f"Total unique URLs discovered across the website: {len(_all_discovered_urls)}")
+    print(f"Total unique pages for which content was extracted: {len(state.extracted)}")
+    print(f"Total unique URLs discovered across the website: {len(state.discovered)}")
 
     # Save discovered URLs to a text file
-    sorted_discovered_urls = sorted(list(_all_discovered_urls))
+    sorted_discovered_urls = sorted(state.discovered)
     try:
         with open(output_filename, 'w', encoding='utf-8') as f:
             for url in sorted_discovered_urls:
@@ -205,7 +220,7 @@ def scrape_website_to_file(start_url, output_filename="discovered_urls.txt",
     except IOError as e:
         print(f"Error saving URLs to file {output_filename}: {e}")
 
-    return _all_extracted_content, sorted_discovered_urls
+    return state.extracted, sorted_discovered_urls
 
 # --- Example Usage ---
 if __name__ == "__main__":